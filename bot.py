@@ -1,13 +1,23 @@
 import os
 import sys
+import io
+import time
 import aiohttp
 import asyncio
 import base64
+import hashlib
 import json
-from typing import Optional, Tuple, List, Dict, Any, Union
+import math
+import mimetypes
+import threading
+import traceback
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Optional, Tuple, List, Dict, Any, Union, Deque
 
 import dotenv
-from pyrogram import Client, filters
+from pyrogram import Client, filters, idle
+from pyrogram.errors import FloodWait
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton, Message, User
 from pymongo import MongoClient
 
@@ -19,11 +29,12 @@ REQUIRED_ENV_VARS = [
     "BOT_TOKEN",
     "API_ID",
     "API_HASH",
-    "PIXELDRAIN_API_KEY",
     "MONGODB_URI",
     "OWNER_ID",
 ]
 missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
+if not os.getenv("PIXELDRAIN_API_KEYS") and not os.getenv("PIXELDRAIN_API_KEY"):
+    missing_vars.append("PIXELDRAIN_API_KEY (or PIXELDRAIN_API_KEYS)")
 if missing_vars:
     print(f"Error: Missing required environment variables: {', '.join(missing_vars)}")
     sys.exit(1)
@@ -40,9 +51,53 @@ except Exception as e:
     print(f"Error initializing bot: {e}")
     sys.exit(1)
 
-PIXELDRAIN_API_KEY: str = os.environ["PIXELDRAIN_API_KEY"]
 OWNER_ID: int = int(os.environ["OWNER_ID"])
 
+# Pixeldrain settings
+PIXELDRAIN_API_KEYS: str = (
+    os.getenv("PIXELDRAIN_API_KEYS") or os.environ["PIXELDRAIN_API_KEY"]
+)
+PIXELDRAIN_KEY_POLICY: str = os.getenv("PIXELDRAIN_KEY_POLICY", "least_inflight")
+PIXELDRAIN_API_URL: str = os.getenv(
+    "PIXELDRAIN_API_URL", "https://pixeldrain.com/api"
+).rstrip("/")
+KEY_BACKOFF_BASE: float = 30.0
+KEY_BACKOFF_MAX: float = 900.0
+KEY_AUTH_EJECT: float = 3600.0
+# `value` fields of Pixeldrain error responses caused by an account's quota
+QUOTA_ERROR_VALUES = (
+    "storage_quota_exceeded",
+    "storage_space_exceeded",
+    "transfer_limit_exceeded",
+)
+
+# Download settings
+DOWNLOAD_DIR: str = os.getenv("DOWNLOAD_DIR", "downloads")
+DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024  # Telegram streams media in 1 MiB chunks
+DOWNLOAD_CHECKPOINT_CHUNKS: int = 16
+DOWNLOAD_MAX_RETRIES: int = 5
+DOWNLOAD_CHECKPOINT_TTL: float = (
+    float(os.getenv("DOWNLOAD_CHECKPOINT_TTL_HOURS", "24")) * 3600
+)
+DOWNLOAD_CLEANUP_INTERVAL: float = 3600.0
+MEDIA_KINDS = (
+    "document",
+    "video",
+    "audio",
+    "photo",
+    "animation",
+    "voice",
+    "video_note",
+    "sticker",
+)
+
+# Diagnostics settings
+LAG_CHECK_INTERVAL: float = float(os.getenv("LAG_CHECK_INTERVAL_MS", "100")) / 1000
+LAG_WARN_THRESHOLD: float = float(os.getenv("LAG_WARN_THRESHOLD_MS", "250")) / 1000
+PROFILE_SAMPLE_INTERVAL: float = 0.005
+PROFILE_DEFAULT_SECONDS: int = 30
+PROFILE_MAX_SECONDS: int = 300
+
 # Constants
 START_TEXT = """Hello {},
 Ready to share some media? Send a file to get a Pixeldrain stream link, or drop a Pixeldrain media ID or link to get the scoop on your file!"""
@@ -58,6 +113,8 @@ try:
     client = MongoClient(MONGODB_URI)
     db = client["pixeldrain_bot"]
     authorized_users_col = db["authorized_users"]
+    uploaded_files_col = db["uploaded_files"]
+    download_checkpoints_col = db["download_checkpoints"]
 except Exception as e:
     print(f"Error connecting to MongoDB: {e}")
     sys.exit(1)
@@ -82,6 +139,13 @@ def authorized_user_filter(_, __, message: Message) -> bool:
     return is_authorized(message.from_user.id)
 
 
+def owner_or_authorized_filter(_, __, message: Message) -> bool:
+    """Filter to check if the user is the owner or an authorized user."""
+    if not message.from_user:
+        return False
+    return message.from_user.id == OWNER_ID or is_authorized(message.from_user.id)
+
+
 def update_user_info(user_id: int, username: str) -> None:
     """Update user information in the database."""
     try:
@@ -112,6 +176,412 @@ async def update_username(bot: Client, user_id: int) -> None:
         print(f"Error updating username for user {user_id}: {e}")
 
 
+# ==================== Diagnostics ====================
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the pct-th percentile (0-100) of values using nearest rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct * len(ordered) / 100) - 1))
+    return ordered[index]
+
+
+class EventLoopLagMonitor:
+    """
+    Measure how long the event loop is blocked between scheduled wake-ups.
+
+    A coroutine sleeps for a fixed interval and records how late it wakes up.
+    A watchdog thread checks the coroutine's heartbeat so that a stall is
+    reported together with the stack of the code blocking the loop while it
+    is still blocked, not only after it has finished.
+    """
+
+    def __init__(
+        self,
+        interval: float = LAG_CHECK_INTERVAL,
+        threshold: float = LAG_WARN_THRESHOLD,
+        history: int = 3000,
+    ) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.samples = 0
+        self.stalls = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.recent: Deque[float] = deque(maxlen=history)
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+
+    async def run(self) -> None:
+        """Sample event loop lag until cancelled."""
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        watchdog.start()
+
+        try:
+            while True:
+                start = loop.time()
+                await asyncio.sleep(self.interval)
+                self._heartbeat = time.monotonic()
+                self.record(max(0.0, loop.time() - start - self.interval))
+        finally:
+            self._stop.set()
+
+    def record(self, lag: float) -> None:
+        """Record a single lag measurement in seconds."""
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        self.recent.append(lag)
+        if lag >= self.threshold:
+            self.stalls += 1
+            print(f"Warning: event loop was blocked for {lag * 1000:.0f} ms")
+
+    def _watch(self) -> None:
+        """Print the loop thread's stack while a stall is in progress."""
+        reported = 0.0
+        while not self._stop.wait(self.interval):
+            heartbeat = self._heartbeat
+            blocked = time.monotonic() - heartbeat - self.interval
+            if blocked < self.threshold or heartbeat == reported:
+                continue
+            reported = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id or 0)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame, limit=15))
+            print(
+                f"Warning: event loop stalled for over {blocked * 1000:.0f} ms in:\n{stack}"
+            )
+
+    def summary(self) -> str:
+        """Return a human-readable summary of the recorded lag."""
+        if not self.samples:
+            return "Event loop lag: no samples yet."
+        recent = list(self.recent)
+        return (
+            f"Event loop lag over {self.samples} samples: "
+            f"avg {self.total_lag / self.samples * 1000:.1f} ms, "
+            f"p50 {percentile(recent, 50) * 1000:.1f} ms, "
+            f"p99 {percentile(recent, 99) * 1000:.1f} ms, "
+            f"max {self.max_lag * 1000:.1f} ms, "
+            f"stalls >= {self.threshold * 1000:.0f} ms: {self.stalls}"
+        )
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for the event loop thread.
+
+    A background thread periodically captures the loop thread's stack, so the
+    overhead is bounded by the sampling interval rather than by how much code
+    runs, which keeps it safe to use on the live bot.
+    """
+
+    def __init__(
+        self,
+        thread_id: int,
+        interval: float = PROFILE_SAMPLE_INTERVAL,
+        max_depth: int = 64,
+    ) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = 0
+        self.self_counts: Counter = Counter()
+        self.total_counts: Counter = Counter()
+        self._started = 0.0
+        self._elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self._stop.clear()
+        self._started = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread to exit."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self._elapsed = time.monotonic() - self._started
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._record(frame)
+
+    def _record(self, frame: Any) -> None:
+        self.samples += 1
+        seen = set()
+        depth = 0
+        while frame is not None and depth < self.max_depth:
+            code = frame.f_code
+            key = (code.co_filename, code.co_firstlineno, code.co_name)
+            if depth == 0:
+                self.self_counts[key] += 1
+            if key not in seen:
+                seen.add(key)
+                self.total_counts[key] += 1
+            frame = frame.f_back
+            depth += 1
+
+    def report(self, top: int = 30) -> str:
+        """Return the hottest functions by own and cumulative samples."""
+        lines = [
+            f"Sampled {self.samples} stacks over {self._elapsed:.1f}s "
+            f"(every {self.interval * 1000:.0f} ms).",
+            "Time spent in selectors/select means the event loop was idle.",
+        ]
+        if not self.samples:
+            return "\n".join(lines)
+
+        for title, counts in (
+            ("Top functions by own time", self.self_counts),
+            ("Top functions by cumulative time", self.total_counts),
+        ):
+            lines.append("")
+            lines.append(f"{title}:")
+            lines.append(f"{'samples':>8} {'%':>6}  function")
+            for (filename, lineno, name), count in counts.most_common(top):
+                share = count / self.samples * 100
+                lines.append(f"{count:>8} {share:>5.1f}%  {name} ({filename}:{lineno})")
+        return "\n".join(lines)
+
+
+LAG_MONITOR = EventLoopLagMonitor()
+PROFILER_LOCK = asyncio.Lock()
+
+
+# ==================== Pixeldrain Key Pool ====================
+
+
+def parse_api_keys(value: str) -> List[Tuple[str, int]]:
+    """Parse a comma separated list of `key` or `key:weight` entries."""
+    keys: List[Tuple[str, int]] = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        key, _, weight = entry.partition(":")
+        keys.append((key.strip(), int(weight) if weight.strip() else 1))
+    return keys
+
+
+def auth_headers(api_key: str) -> Dict[str, str]:
+    """Build the Basic Auth header Pixeldrain expects for an API key."""
+    credentials = base64.b64encode(f":{api_key}".encode()).decode()
+    return {"Authorization": f"Basic {credentials}"}
+
+
+class PixeldrainAccount:
+    """A Pixeldrain API key together with its load and health state."""
+
+    def __init__(self, api_key: str, weight: int = 1) -> None:
+        self.api_key = api_key
+        self.weight = max(1, weight)
+        # Stored alongside uploaded files instead of the key itself
+        self.name = hashlib.sha256(api_key.encode()).hexdigest()[:12]
+        self.in_flight = 0
+        self.uploads = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.current_weight = 0
+
+    def is_healthy(self, now: float) -> bool:
+        """Check if the account is not currently ejected."""
+        return now >= self.ejected_until
+
+
+class PixeldrainKeyPool:
+    """
+    Spread uploads over several Pixeldrain accounts.
+
+    Accounts are picked either by the lowest number of in-flight uploads
+    relative to their weight (`least_inflight`) or by smooth weighted
+    round-robin (`weighted`). Accounts that answer with 429, 5xx or a quota
+    error are ejected for a backoff period and skipped until it expires.
+    """
+
+    POLICIES = ("least_inflight", "weighted")
+
+    def __init__(
+        self,
+        keys: List[Tuple[str, int]],
+        policy: str = "least_inflight",
+        clock: Any = time.monotonic,
+    ) -> None:
+        if not keys:
+            raise ValueError("At least one Pixeldrain API key is required")
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown key policy: {policy}")
+        self.accounts = [PixeldrainAccount(key, weight) for key, weight in keys]
+        self.policy = policy
+        self.clock = clock
+        self._by_name = {account.name: account for account in self.accounts}
+
+    def get(self, name: Optional[str]) -> Optional[PixeldrainAccount]:
+        """Look up an account by its stored name."""
+        return self._by_name.get(name) if name else None
+
+    def acquire(self, exclude: Optional[set] = None) -> PixeldrainAccount:
+        """Pick an account for the next upload and mark it in flight."""
+        now = self.clock()
+        candidates = [
+            account
+            for account in self.accounts
+            if not exclude or account.name not in exclude
+        ] or self.accounts
+        healthy = [account for account in candidates if account.is_healthy(now)]
+
+        if not healthy:
+            # Every account is ejected, keep spreading the load over all of them
+            healthy = candidates
+
+        if self.policy == "weighted":
+            total = sum(a.weight for a in healthy)
+            for candidate in healthy:
+                candidate.current_weight += candidate.weight
+            account = max(healthy, key=lambda a: a.current_weight)
+            account.current_weight -= total
+        else:
+            account = min(healthy, key=lambda a: (a.in_flight / a.weight, a.uploads))
+
+        account.in_flight += 1
+        account.uploads += 1
+        return account
+
+    def release(
+        self, account: PixeldrainAccount, response_data: Dict[str, Any]
+    ) -> bool:
+        """
+        Return an account to the pool and update its health.
+
+        Returns:
+            True if the upload failed because of this account and should be
+            retried with another one.
+        """
+        account.in_flight = max(0, account.in_flight - 1)
+
+        if "error" not in response_data:
+            account.failures = 0
+            return False
+
+        status = response_data.get("status")
+        quota_error = response_data.get("value") in QUOTA_ERROR_VALUES
+        now = self.clock()
+
+        if status == 401:
+            account.ejected_until = now + KEY_AUTH_EJECT
+            print(
+                f"Pixeldrain account {account.name} was rejected with HTTP 401, "
+                f"ejecting for {KEY_AUTH_EJECT:.0f}s"
+            )
+            return True
+
+        if quota_error and not any(
+            other is not account and other.is_healthy(now) for other in self.accounts
+        ):
+            # Likely this file is too big for what is left, don't empty the pool
+            print(f"Pixeldrain account {account.name} is out of quota for this file")
+            return False
+
+        if quota_error or status == 429 or (status is not None and status >= 500):
+            account.failures += 1
+            backoff = min(
+                KEY_BACKOFF_MAX, KEY_BACKOFF_BASE * 2 ** (account.failures - 1)
+            )
+            try:
+                # Prefer the server's own estimate when it sends one
+                if response_data.get("retry_after"):
+                    backoff = min(KEY_BACKOFF_MAX, float(response_data["retry_after"]))
+            except ValueError:
+                pass
+            account.ejected_until = now + backoff
+            print(
+                f"Pixeldrain account {account.name} returned HTTP {status}, "
+                f"ejecting for {backoff:.0f}s"
+            )
+            return True
+
+        return False
+
+    def summary(self) -> str:
+        """Return a short status line for every account."""
+        now = self.clock()
+        lines = []
+        for account in self.accounts:
+            state = (
+                "healthy"
+                if account.is_healthy(now)
+                else f"ejected for {account.ejected_until - now:.0f}s"
+            )
+            lines.append(
+                f"{account.name}: {state}, in flight {account.in_flight}, "
+                f"uploads {account.uploads}, weight {account.weight}"
+            )
+        return "\n".join(lines)
+
+
+try:
+    KEY_POOL = PixeldrainKeyPool(
+        parse_api_keys(PIXELDRAIN_API_KEYS), policy=PIXELDRAIN_KEY_POLICY
+    )
+except ValueError as e:
+    print(f"Error configuring Pixeldrain API keys: {e}")
+    sys.exit(1)
+
+
+def record_upload(
+    file_id: str, account: PixeldrainAccount, user_id: Optional[int]
+) -> None:
+    """Remember which account holds an uploaded file."""
+    try:
+        uploaded_files_col.update_one(
+            {"file_id": file_id},
+            {
+                "$set": {
+                    "account": account.name,
+                    "user_id": user_id,
+                    "uploaded_at": time.time(),
+                }
+            },
+            upsert=True,
+        )
+    except Exception as e:
+        print(f"Error recording upload {file_id}: {e}")
+
+
+def get_upload_record(file_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch the stored upload record for a Pixeldrain file."""
+    try:
+        return uploaded_files_col.find_one({"file_id": file_id})
+    except Exception as e:
+        print(f"Error looking up upload {file_id}: {e}")
+        return None
+
+
+def get_file_account(file_id: str) -> Optional[PixeldrainAccount]:
+    """Find the account that holds a Pixeldrain file, if it is known."""
+    record = get_upload_record(file_id)
+    return KEY_POOL.get(record.get("account")) if record else None
+
+
 # ==================== Command Handlers ====================
 
 
@@ -259,6 +729,73 @@ async def unauth(bot: Client, message: Message) -> None:
         await message.reply_text(f"Error: {str(e)}")
 
 
+@Bot.on_message(filters.command("profile"))
+async def profile(bot: Client, message: Message) -> None:
+    """Handler for /profile command (only for the bot owner)."""
+    if not message.from_user or message.from_user.id != OWNER_ID:
+        await message.reply_text("You are not authorized to use this command.")
+        return
+
+    if PROFILER_LOCK.locked():
+        await message.reply_text("A profiling session is already running.")
+        return
+
+    try:
+        seconds = (
+            int(message.command[1])
+            if len(message.command) > 1
+            else PROFILE_DEFAULT_SECONDS
+        )
+    except ValueError:
+        await message.reply_text("Usage: /profile <seconds>")
+        return
+
+    if not 1 <= seconds <= PROFILE_MAX_SECONDS:
+        await message.reply_text(
+            f"Duration must be between 1 and {PROFILE_MAX_SECONDS} seconds."
+        )
+        return
+
+    # Taken here so a second /profile is refused before this one's task starts
+    await PROFILER_LOCK.acquire()
+    asyncio.create_task(run_profile(message, seconds))
+
+
+async def run_profile(message: Message, seconds: int) -> None:
+    """
+    Sample the bot for `seconds` and reply with the report.
+
+    Runs as its own task so the session doesn't hold a handler worker.
+    Releases PROFILER_LOCK when done.
+    """
+    try:
+        status = await message.reply_text(f"`Profiling for {seconds}s...`", quote=True)
+        profiler = SamplingProfiler(threading.get_ident())
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.stop()
+
+        report = io.BytesIO(
+            f"{profiler.report()}\n\n{LAG_MONITOR.summary()}\n".encode()
+        )
+        report.name = f"profile_{int(time.time())}.txt"
+        await message.reply_document(
+            document=report,
+            caption=f"Profile of the last {seconds}s\n{LAG_MONITOR.summary()}",
+            quote=True,
+        )
+        await status.delete()
+    except Exception as e:
+        try:
+            await message.reply_text(f"Error while profiling: {str(e)}")
+        except Exception as reply_error:
+            print(f"Error reporting profiling failure: {reply_error}")
+    finally:
+        PROFILER_LOCK.release()
+
+
 # ==================== Utility Functions ====================
 
 
@@ -310,10 +847,13 @@ def format_date(date_str: str) -> str:
 
 async def send_data(file_id: str, message: Message) -> None:
     """Fetch and send Pixeldrain file information."""
+    account = get_file_account(file_id)
+    headers = auth_headers(account.api_key) if account else {}
+
     try:
         async with aiohttp.ClientSession() as session:
             async with session.get(
-                f"https://pixeldrain.com/api/file/{file_id}/info"
+                f"{PIXELDRAIN_API_URL}/file/{file_id}/info", headers=headers
             ) as response:
                 if response.status == 200:
                     try:
@@ -373,6 +913,71 @@ async def send_data(file_id: str, message: Message) -> None:
         print(f"Error editing message: {e}")
 
 
+async def delete_file(file_id: str, account: PixeldrainAccount) -> Optional[str]:
+    """Delete a Pixeldrain file with the account that holds it.
+
+    Returns:
+        None on success, otherwise an error description.
+    """
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.delete(
+                f"{PIXELDRAIN_API_URL}/file/{file_id}",
+                headers=auth_headers(account.api_key),
+            ) as response:
+                if response.status >= 400:
+                    error_text = await response.text()
+                    return f"HTTP {response.status}: {error_text}"
+    except Exception as e:
+        return str(e)
+
+    try:
+        uploaded_files_col.delete_one({"file_id": file_id})
+    except Exception as e:
+        print(f"Error removing upload record {file_id}: {e}")
+    return None
+
+
+# ==================== Delete Handler ====================
+
+
+@Bot.on_message(filters.command("pddel") & filters.create(owner_or_authorized_filter))
+async def delete_command(bot: Client, message: Message) -> None:
+    """Handler for authorized users to delete files uploaded through the bot."""
+    if not message.from_user:
+        return
+
+    file_id = get_id(message.command[1]) if len(message.command) > 1 else None
+    if not file_id:
+        await message.reply_text("Usage: /pddel <Pixeldrain ID or link>")
+        return
+
+    record = get_upload_record(file_id)
+    if not record:
+        await message.reply_text("This file was not uploaded through this bot.")
+        return
+
+    if (
+        message.from_user.id != OWNER_ID
+        and record.get("user_id") != message.from_user.id
+    ):
+        await message.reply_text("You can only delete files you uploaded.")
+        return
+
+    account = KEY_POOL.get(record.get("account"))
+    if not account:
+        await message.reply_text(
+            "The account holding this file is no longer configured."
+        )
+        return
+
+    error = await delete_file(file_id, account)
+    if error:
+        await message.reply_text(f"Failed to delete file: `{error}`")
+    else:
+        await message.reply_text(f"File `{file_id}` has been deleted.")
+
+
 # ==================== Info Handler ====================
 
 
@@ -398,6 +1003,352 @@ async def info(bot: Client, update: Message) -> None:
         print(f"Error in info handler: {e}")
 
 
+# ==================== Resumable Downloads ====================
+
+_download_locks: Dict[str, asyncio.Lock] = {}
+_download_waiters: Counter = Counter()
+
+
+def get_media(message: Message) -> Optional[Any]:
+    """Return the downloadable media object of a message."""
+    for kind in MEDIA_KINDS:
+        media = getattr(message, kind, None)
+        if media is not None:
+            return media
+    return None
+
+
+def get_media_file_name(media: Any) -> str:
+    """Pick a file name for downloaded media."""
+    file_name = getattr(media, "file_name", None)
+    if file_name:
+        return os.path.basename(file_name)
+    mime_type = getattr(media, "mime_type", None)
+    extension = (mimetypes.guess_extension(mime_type) or "") if mime_type else ".jpg"
+    return f"{media.file_unique_id}{extension}"
+
+
+def load_checkpoint(file_unique_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch the download checkpoint for a file."""
+    try:
+        return download_checkpoints_col.find_one({"file_unique_id": file_unique_id})
+    except Exception as e:
+        print(f"Error loading download checkpoint for {file_unique_id}: {e}")
+        return None
+
+
+def save_checkpoint(
+    file_unique_id: str,
+    file_id: str,
+    path: str,
+    size: int,
+    offset: int,
+    origin: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Record that the first `offset` bytes of a download are on disk.
+
+    `origin` identifies the request (chat, media message, status message and
+    uploader) so the download can be picked up again after a restart.
+    """
+    try:
+        download_checkpoints_col.update_one(
+            {"file_unique_id": file_unique_id},
+            {
+                "$set": {
+                    "file_id": file_id,
+                    "path": path,
+                    "size": size,
+                    "offset": offset,
+                    "updated_at": datetime.now(timezone.utc),
+                    **(origin or {}),
+                }
+            },
+            upsert=True,
+        )
+    except Exception as e:
+        print(f"Error saving download checkpoint for {file_unique_id}: {e}")
+
+
+def clear_checkpoint(file_unique_id: str) -> None:
+    """Forget the download checkpoint for a file."""
+    try:
+        download_checkpoints_col.delete_one({"file_unique_id": file_unique_id})
+    except Exception as e:
+        print(f"Error clearing download checkpoint for {file_unique_id}: {e}")
+
+
+def cleanup_stale_downloads(active: set) -> None:
+    """
+    Delete partial downloads nobody resumed within DOWNLOAD_CHECKPOINT_TTL.
+
+    Their checkpoints are removed too; checkpoints whose partial file is
+    already gone expire through the TTL index on `updated_at`.
+    """
+    cutoff = time.time() - DOWNLOAD_CHECKPOINT_TTL
+    try:
+        names = os.listdir(DOWNLOAD_DIR)
+    except FileNotFoundError:
+        return
+
+    for name in names:
+        unique_id, extension = os.path.splitext(name)
+        if extension != ".part" or unique_id in active:
+            continue
+        part_path = os.path.join(DOWNLOAD_DIR, name)
+        try:
+            if os.path.getmtime(part_path) >= cutoff:
+                continue
+            os.remove(part_path)
+        except OSError as e:
+            print(f"Error removing stale download {part_path}: {e}")
+            continue
+        clear_checkpoint(unique_id)
+        print(f"Removed stale partial download {name}")
+
+
+async def cleanup_downloads_loop() -> None:
+    """Periodically remove abandoned partial downloads until cancelled."""
+    while True:
+        await asyncio.to_thread(cleanup_stale_downloads, set(_download_locks))
+        await asyncio.sleep(DOWNLOAD_CLEANUP_INTERVAL)
+
+
+async def resume_pending_downloads(bot: Client) -> None:
+    """Pick up downloads that were interrupted by a restart of the bot."""
+    try:
+        # Checkpoints written before the origin was recorded can't be resumed
+        pending = [
+            checkpoint
+            for checkpoint in download_checkpoints_col.find({})
+            if checkpoint.get("chat_id") is not None
+        ]
+    except Exception as e:
+        print(f"Error loading pending downloads: {e}")
+        return
+
+    for checkpoint in pending:
+        asyncio.create_task(resume_download(bot, checkpoint))
+    if pending:
+        print(f"Resuming {len(pending)} interrupted download(s)")
+
+
+async def resume_download(bot: Client, checkpoint: Dict[str, Any]) -> None:
+    """
+    Re-fetch the message of an interrupted download and hand it to handle_media.
+
+    The re-fetched message carries a fresh file reference. If it is gone or the
+    uploader lost access meanwhile, the user is asked to send the file again.
+    """
+    unique_id: str = checkpoint["file_unique_id"]
+    chat_id: int = checkpoint["chat_id"]
+    uploader_id: Optional[int] = checkpoint.get("uploader_id")
+    message: Optional[Message] = None
+    update: Optional[Message] = None
+    try:
+        if checkpoint.get("status_message_id"):
+            message = await bot.get_messages(chat_id, checkpoint["status_message_id"])
+        update = await bot.get_messages(chat_id, checkpoint["message_id"])
+    except Exception as e:
+        print(f"Error fetching interrupted download {unique_id}: {e}")
+
+    if message is not None and getattr(message, "empty", False):
+        message = None
+    media = (
+        get_media(update) if update and not getattr(update, "empty", False) else None
+    )
+    if (
+        media is not None
+        and media.file_unique_id == unique_id
+        and (uploader_id is None or is_authorized(uploader_id))
+    ):
+        await handle_media(bot, update, uploader_id, message)
+        return
+
+    clear_checkpoint(unique_id)
+    try:
+        os.remove(checkpoint["path"])
+    except OSError:
+        pass
+    if message:
+        try:
+            await message.edit_text(
+                text="Error: The download was interrupted by a restart and could not be resumed. Please send the file again.",
+                disable_web_page_preview=True,
+            )
+        except Exception as e:
+            print(f"Error updating message: {e}")
+
+
+def verified_offset(
+    part_path: str, checkpoint: Optional[Dict[str, Any]], size: int
+) -> int:
+    """
+    Work out how much of a partial download can be resumed from.
+
+    Only bytes that were both checkpointed and are present on disk are
+    trusted, rounded down to a whole chunk since Telegram can only resume
+    on chunk boundaries.
+    """
+    if not checkpoint or checkpoint.get("size") != size:
+        return 0
+    try:
+        on_disk = os.path.getsize(part_path)
+    except OSError:
+        return 0
+    offset = min(int(checkpoint.get("offset", 0)), on_disk)
+    return offset - offset % DOWNLOAD_CHUNK_SIZE
+
+
+async def download_media_resumable(
+    bot: Client,
+    update: Message,
+    message: Optional[Message] = None,
+    uploader_id: Optional[int] = None,
+) -> str:
+    """
+    Download the media of a message chunk by chunk with checkpoints.
+
+    Progress is stored per `file_unique_id`, so a download interrupted by a
+    network error, a FloodWait or a restart continues from the last verified
+    offset instead of starting over. The checkpoint also records where the
+    request came from, so resume_pending_downloads can restart it on boot.
+    Partial downloads that are not resumed within DOWNLOAD_CHECKPOINT_TTL are
+    removed by the cleanup task.
+
+    Args:
+        bot: Client used to stream the media
+        update: Message containing the media
+        message: Optional Telegram message object for progress updates
+        uploader_id: Telegram ID of the user requesting the upload
+
+    Returns:
+        Path of the completely downloaded file
+    """
+    media = get_media(update)
+    if media is None:
+        raise ValueError("This message doesn't contain any downloadable media")
+
+    unique_id: str = media.file_unique_id
+    file_size: int = getattr(media, "file_size", 0) or 0
+    if not file_size:
+        # Without the size a stream cut short by a swallowed error looks complete
+        raise ValueError("Telegram did not report the file size, cannot verify it")
+    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+    part_path = os.path.join(DOWNLOAD_DIR, f"{unique_id}.part")
+
+    # Serialize downloads of the same file so they don't share a .part file
+    lock = _download_locks.setdefault(unique_id, asyncio.Lock())
+    _download_waiters[unique_id] += 1
+    try:
+        async with lock:
+            return await _download_to_part(
+                bot, update, message, media, part_path, file_size, uploader_id
+            )
+    finally:
+        _download_waiters[unique_id] -= 1
+        if not _download_waiters[unique_id]:
+            del _download_waiters[unique_id]
+            _download_locks.pop(unique_id, None)
+
+
+async def _download_to_part(
+    bot: Client,
+    update: Message,
+    message: Optional[Message],
+    media: Any,
+    part_path: str,
+    file_size: int,
+    uploader_id: Optional[int],
+) -> str:
+    unique_id: str = media.file_unique_id
+    origin = {
+        "chat_id": update.chat.id,
+        "message_id": update.id,
+        "status_message_id": message.id if message else None,
+        "uploader_id": uploader_id,
+    }
+    offset = verified_offset(part_path, load_checkpoint(unique_id), file_size)
+    if offset and message:
+        try:
+            await message.edit_text(
+                text=f"`Resuming download from {format_size(offset)} of {format_size(file_size)}...`",
+                disable_web_page_preview=True,
+            )
+        except Exception as e:
+            print(f"Error updating message: {e}")
+
+    async def checkpoint(file: Any) -> None:
+        file.flush()
+        await asyncio.to_thread(os.fsync, file.fileno())
+        save_checkpoint(unique_id, media.file_id, part_path, file_size, offset, origin)
+
+    # Only failures in a row without progress count towards the retry limit
+    attempts = 0
+    failed_at = -1
+    with open(part_path, "r+b" if offset else "wb") as file:
+        # Recorded right away so a restart before the first checkpoint resumes too
+        save_checkpoint(unique_id, media.file_id, part_path, file_size, offset, origin)
+        while True:
+            # Drop anything written after the last complete chunk
+            file.seek(offset)
+            file.truncate()
+            pending = 0
+            try:
+                async for chunk in bot.stream_media(
+                    update, offset=offset // DOWNLOAD_CHUNK_SIZE
+                ):
+                    file.write(chunk)
+                    offset += len(chunk)
+                    pending += 1
+                    if pending >= DOWNLOAD_CHECKPOINT_CHUNKS:
+                        await checkpoint(file)
+                        pending = 0
+                if offset >= file_size:
+                    break
+                raise IOError(
+                    f"Stream ended at {format_size(offset)} of {format_size(file_size)}"
+                )
+            except FloodWait as e:
+                await checkpoint(file)
+                wait = e.value if isinstance(e.value, int) else 1
+                if message:
+                    try:
+                        await message.edit_text(
+                            text=f"`Telegram asked to wait {wait}s, download will resume at {format_size(offset)}...`",
+                            disable_web_page_preview=True,
+                        )
+                    except Exception as edit_error:
+                        print(f"Error updating message: {edit_error}")
+                await asyncio.sleep(wait)
+            except Exception as e:
+                await checkpoint(file)
+                if offset > failed_at:
+                    attempts = 0
+                failed_at = offset
+                attempts += 1
+                if attempts > DOWNLOAD_MAX_RETRIES:
+                    raise
+                print(
+                    f"Download of {unique_id} failed at {format_size(offset)} "
+                    f"(attempt {attempts}): {e}"
+                )
+                await asyncio.sleep(min(30, 2**attempts))
+
+    downloaded = os.path.getsize(part_path)
+    if downloaded != file_size:
+        clear_checkpoint(unique_id)
+        os.remove(part_path)
+        raise IOError(
+            f"Downloaded {downloaded} bytes but the file has {file_size} bytes"
+        )
+
+    media_path = os.path.join(DOWNLOAD_DIR, get_media_file_name(media))
+    os.replace(part_path, media_path)
+    clear_checkpoint(unique_id)
+    return media_path
+
+
 # ==================== Media Upload Handlers ====================
 
 
@@ -409,17 +1360,34 @@ async def media_filter(bot: Client, update: Message) -> None:
     await handle_media(bot, update)
 
 
-async def handle_media(bot: Client, update: Message) -> None:
-    """Handle media upload to Pixeldrain."""
+async def handle_media(
+    bot: Client,
+    update: Message,
+    uploader_id: Optional[int] = None,
+    message: Optional[Message] = None,
+) -> None:
+    """
+    Handle media upload to Pixeldrain.
+
+    Args:
+        bot: Client that received the update
+        update: Message containing the media
+        uploader_id: Telegram ID of the user requesting the upload, defaults
+            to the sender of the media
+        message: Status message to reuse, a new reply is sent if omitted
+    """
     logs: List[str] = []
+    if uploader_id is None and update.from_user:
+        uploader_id = update.from_user.id
 
-    try:
-        message = await update.reply_text(
-            text="`Processing...`", quote=True, disable_web_page_preview=True
-        )
-    except Exception as e:
-        print(f"Error sending processing message: {e}")
-        return
+    if message is None:
+        try:
+            message = await update.reply_text(
+                text="`Processing...`", quote=True, disable_web_page_preview=True
+            )
+        except Exception as e:
+            print(f"Error sending processing message: {e}")
+            return
 
     try:
         # Update status
@@ -433,7 +1401,9 @@ async def handle_media(bot: Client, update: Message) -> None:
         # Download the media
         media_path: Optional[str] = None
         try:
-            media_path = await update.download()
+            media_path = await download_media_resumable(
+                bot, update, message, uploader_id
+            )
         except Exception as e:
             await message.edit_text(
                 text=f"Error downloading media: `{str(e)}`",
@@ -498,7 +1468,12 @@ async def handle_media(bot: Client, update: Message) -> None:
         # Queue the upload to run in background
         try:
             asyncio.create_task(
-                background_upload(renamed_file, PIXELDRAIN_API_KEY, message, logs)
+                background_upload(
+                    renamed_file,
+                    message,
+                    logs,
+                    uploader_id,
+                )
             )
             await message.edit_text(
                 text="`Upload queued — processing in background. You'll get a link when it's ready.`",
@@ -543,9 +1518,7 @@ async def upload_file_stream(
         file_size = os.path.getsize(file_path)
         logs.append(f"File size: {format_size(file_size)}")
 
-        # Create Basic Auth credentials
-        credentials = base64.b64encode(f":{pixeldrain_api_key}".encode()).decode()
-        headers = {"Authorization": f"Basic {credentials}"}
+        headers = auth_headers(pixeldrain_api_key)
 
         async with aiohttp.ClientSession() as session:
             with open(file_path, "rb") as file:
@@ -560,7 +1533,7 @@ async def upload_file_stream(
 
                 # Upload the file
                 async with session.post(
-                    "https://pixeldrain.com/api/file",
+                    f"{PIXELDRAIN_API_URL}/file",
                     data=data,
                     headers=headers,
                     timeout=aiohttp.ClientTimeout(total=None),
@@ -571,7 +1544,16 @@ async def upload_file_stream(
                         logs.append(
                             f"Upload failed with status {response.status}: {error_text}"
                         )
-                        return {"error": f"HTTP {response.status}: {error_text}"}, logs
+                        try:
+                            value = json.loads(error_text).get("value")
+                        except Exception:
+                            value = None
+                        return {
+                            "error": f"HTTP {response.status}: {error_text}",
+                            "status": response.status,
+                            "value": value,
+                            "retry_after": response.headers.get("Retry-After"),
+                        }, logs
 
                     # Try to parse JSON response
                     try:
@@ -608,20 +1590,55 @@ async def upload_file_stream(
         return {"error": str(e)}, logs
 
 
+async def upload_with_pool(
+    file_path: str, pool: PixeldrainKeyPool, message: Optional[Message] = None
+) -> Tuple[Dict[str, Any], List[str], PixeldrainAccount]:
+    """
+    Upload a file using an account from the pool, failing over to other
+    accounts when the chosen one is rate limited, erroring or out of quota.
+
+    Args:
+        file_path: Path to the file to upload
+        pool: Pool of Pixeldrain accounts
+        message: Optional Telegram message object for progress updates
+
+    Returns:
+        Tuple of (response_data, logs, account used for the last attempt)
+    """
+    logs: List[str] = []
+    tried: set = set()
+
+    while True:
+        account = pool.acquire(exclude=tried)
+        tried.add(account.name)
+        response_data: Dict[str, Any] = {"error": "Upload was interrupted"}
+        try:
+            response_data, upload_logs = await upload_file_stream(
+                file_path, account.api_key, message
+            )
+            logs.extend(upload_logs)
+        finally:
+            retry = pool.release(account, response_data)
+
+        if not retry or len(tried) >= len(pool.accounts):
+            return response_data, logs, account
+        logs.append(f"Account {account.name} is unavailable, trying another one")
+
+
 async def background_upload(
     file_path: str,
-    pixeldrain_api_key: str,
     message: Message,
     initial_logs: Optional[List[str]] = None,
+    user_id: Optional[int] = None,
 ) -> None:
     """
     Run the upload in background and update the Telegram message when done.
 
     Args:
         file_path: Path to the file to upload
-        pixeldrain_api_key: API key for Pixeldrain
         message: Telegram message to update
         initial_logs: Optional initial logs
+        user_id: Telegram ID of the user who sent the file
     """
     logs = initial_logs if initial_logs else []
 
@@ -634,8 +1651,8 @@ async def background_upload(
         except Exception as e:
             print(f"Error updating message: {e}")
 
-        response_data, upload_logs = await upload_file_stream(
-            file_path, pixeldrain_api_key, message
+        response_data, upload_logs, account = await upload_with_pool(
+            file_path, KEY_POOL, message
         )
         logs.extend(upload_logs)
 
@@ -658,6 +1675,7 @@ async def background_upload(
             # Send file info if ID is available
             file_id = response_data.get("id")
             if file_id:
+                record_upload(file_id, account, user_id)
                 await send_data(file_id, message)
             else:
                 # If no ID but raw response exists, show it
@@ -728,7 +1746,11 @@ async def group_upload_command(bot: Client, message: Message) -> None:
         or replied_message.video
         or replied_message.audio
     ):
-        await handle_media(bot, replied_message)
+        await handle_media(
+            bot,
+            replied_message,
+            message.from_user.id if message.from_user else None,
+        )
     else:
         await message.reply_text(
             "Please reply to a valid media message with /pdup to upload."
@@ -737,10 +1759,34 @@ async def group_upload_command(bot: Client, message: Message) -> None:
 
 # ==================== Main ====================
 
+
+async def main() -> None:
+    """Start the bot together with the lag monitor and download cleanup."""
+    try:
+        uploaded_files_col.create_index("file_id", unique=True)
+        download_checkpoints_col.create_index("file_unique_id", unique=True)
+        download_checkpoints_col.create_index(
+            "updated_at", expireAfterSeconds=int(DOWNLOAD_CHECKPOINT_TTL)
+        )
+    except Exception as e:
+        print(f"Error creating database indexes: {e}")
+
+    await Bot.start()
+    await resume_pending_downloads(Bot)
+    lag_monitor_task = asyncio.create_task(LAG_MONITOR.run())
+    cleanup_task = asyncio.create_task(cleanup_downloads_loop())
+    try:
+        await idle()
+    finally:
+        lag_monitor_task.cancel()
+        cleanup_task.cancel()
+        await Bot.stop()
+
+
 if __name__ == "__main__":
     print("Bot is starting...")
     try:
-        Bot.run()
+        Bot.run(main())
     except KeyboardInterrupt:
         print("Bot stopped by user.")
     except Exception as e:
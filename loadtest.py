@@ -0,0 +1,686 @@
+"""
+Load and soak test for the bot's handler dispatch path.
+
+Feeds synthetic messages through the bot's real pyrogram dispatcher, so they
+wait for one of the `Client.workers` handler workers, run the registered
+filters and reach the real handlers (`media_filter`, `info`,
+`group_upload_command` and `auths`) exactly like live updates. Telegram API
+calls are faked on the Client, uploads go to the local Pixeldrain stand-in from
+pixeldrain_stub.py and MongoDB is replaced by in-memory collections. Users are
+ramped up in stages, then optionally held at the maximum for a soak run:
+
+    python loadtest.py --users 50 --step 10 --stage-seconds 30 --soak-seconds 600
+
+Every stage reports throughput, time spent queued for a worker or a download
+slot, per-handler latency percentiles, worker saturation, event loop lag and
+resident memory with its change since the previous stage, so scaling
+regressions and leaks show up before production.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import gc
+import os
+import random
+import resource
+import secrets
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+from typing import Optional, List, Dict, Any
+
+from pyrogram.enums import ChatType, MessageMediaType
+from pyrogram.errors import FloodWait
+from pyrogram.handlers import MessageHandler
+
+from pixeldrain_stub import PixeldrainStub
+
+OWNER_ID = 1
+CHUNK_SIZE = 1024 * 1024
+SCENARIOS = {
+    "media_filter": 50,
+    "info": 30,
+    "group_upload_command": 15,
+    "auths": 5,
+}
+
+
+# ==================== In-Memory MongoDB ====================
+
+
+class InMemoryCollection:
+    """The subset of a pymongo collection the bot uses."""
+
+    def __init__(self) -> None:
+        self.documents: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def matches(document: Dict[str, Any], query: Dict[str, Any]) -> bool:
+        return all(document.get(key) == value for key, value in query.items())
+
+    def find(self, query: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        return [dict(d) for d in self.documents if self.matches(d, query or {})]
+
+    def find_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        for document in self.documents:
+            if self.matches(document, query):
+                return dict(document)
+        return None
+
+    def insert_one(self, document: Dict[str, Any]) -> SimpleNamespace:
+        self.documents.append(dict(document))
+        return SimpleNamespace(inserted_id=len(self.documents))
+
+    def update_one(
+        self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False
+    ) -> SimpleNamespace:
+        for document in self.documents:
+            if self.matches(document, query):
+                document.update(update.get("$set", {}))
+                return SimpleNamespace(matched_count=1)
+        if upsert:
+            self.documents.append({**query, **update.get("$set", {})})
+        return SimpleNamespace(matched_count=0)
+
+    def delete_one(self, query: Dict[str, Any]) -> SimpleNamespace:
+        for index, document in enumerate(self.documents):
+            if self.matches(document, query):
+                del self.documents[index]
+                return SimpleNamespace(deleted_count=1)
+        return SimpleNamespace(deleted_count=0)
+
+    def create_index(self, *args: Any, **kwargs: Any) -> str:
+        return "index"
+
+
+# ==================== Fake Telegram Layer ====================
+
+
+class FakeUser:
+    def __init__(self, user_id: int) -> None:
+        self.id = user_id
+        self.username = f"user{user_id}"
+        self.mention = f"[User {user_id}](tg://user?id={user_id})"
+
+
+class FakeMessage:
+    """
+    Stand-in for a pyrogram Message.
+
+    Carries the attributes pyrogram's filters look at. Replies sent by the bot
+    are FakeMessages too; `done` is set once the bot edits a reply into its
+    final state (file info or an error). `handled` resolves when the handler
+    the dispatcher picked for the message returns.
+    """
+
+    FINAL_PREFIXES = ("Error", "Failed", "Unexpected", "Uploaded but")
+
+    def __init__(
+        self,
+        client: "FakeClient",
+        from_user: Optional[FakeUser] = None,
+        text: Optional[str] = None,
+        document: Optional[SimpleNamespace] = None,
+        reply_to_message: Optional["FakeMessage"] = None,
+        chat_type: ChatType = ChatType.PRIVATE,
+    ) -> None:
+        self._client = client
+        self.id = client.next_message_id()
+        self.chat = SimpleNamespace(
+            id=from_user.id if from_user else 0, type=chat_type, username=None
+        )
+        self.from_user = from_user
+        self.text = text
+        self.caption = None
+        self.command = text.lstrip("/").split() if text else []
+        self.document = document
+        self.media = MessageMediaType.DOCUMENT if document else None
+        self.photo = self.video = self.audio = None
+        self.reply_to_message = reply_to_message
+        self.reply_to_message_id = reply_to_message.id if reply_to_message else None
+        self.reply_markup = None
+        self.last_reply: Optional["FakeMessage"] = None
+        self.done = asyncio.Event()
+        self.handled: "asyncio.Future[None]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        self.handler: Optional[str] = None
+        self.enqueued = self.dequeued = self.started = self.finished = 0.0
+
+    async def reply_text(self, text: str, **kwargs: Any) -> "FakeMessage":
+        await self._client.api_call()
+        self.last_reply = FakeMessage(self._client, text=text)
+        return self.last_reply
+
+    async def edit_text(
+        self, text: str, reply_markup: Any = None, **kwargs: Any
+    ) -> "FakeMessage":
+        await self._client.api_call()
+        self.text = text
+        self.reply_markup = reply_markup
+        if reply_markup is not None or text.startswith(self.FINAL_PREFIXES):
+            self.done.set()
+        return self
+
+    async def reply_document(self, document: Any, **kwargs: Any) -> "FakeMessage":
+        await self._client.api_call()
+        return FakeMessage(self._client)
+
+    async def delete(self) -> None:
+        await self._client.api_call()
+
+
+class FakeClient:
+    """
+    Fake Telegram API for the pyrogram Client.
+
+    `install` puts its methods on the bot's real Client, which the dispatcher
+    passes to the handlers. Bot API calls take `api_latency` seconds, media
+    streams at `download_speed` bytes per second and a share of streamed
+    chunks raise FloodWait. Like pyrogram's `get_file`, a stream holds the
+    Client's `get_file_semaphore` until it ends, so downloads queue behind
+    `max_concurrent_transmissions`.
+    """
+
+    def __init__(
+        self,
+        rng: random.Random,
+        api_latency: float,
+        download_speed: float,
+        flood_rate: float,
+        flood_wait: int,
+    ) -> None:
+        self.rng = rng
+        self.api_latency = api_latency
+        self.download_speed = download_speed
+        self.flood_rate = flood_rate
+        self.flood_wait = flood_wait
+        self.flood_waits = 0
+        self.transmission_waits: List[float] = []
+        self.client: Any = None
+        self._message_id = 0
+
+    def install(self, client: Any) -> None:
+        self.client = client
+        client.me = SimpleNamespace(
+            id=0, username="pixeldrain_loadtest_bot", usernames=None
+        )
+        client.get_users = self.get_users
+        client.stream_media = self.stream_media
+        # Don't ask Telegram for missed updates when the dispatcher starts
+        client.skip_updates = True
+
+    def next_message_id(self) -> int:
+        self._message_id += 1
+        return self._message_id
+
+    async def api_call(self) -> None:
+        if self.api_latency:
+            await asyncio.sleep(self.api_latency)
+
+    async def get_users(self, user_id: int) -> FakeUser:
+        await self.api_call()
+        return FakeUser(user_id)
+
+    async def stream_media(self, message: FakeMessage, offset: int = 0) -> Any:
+        media = message.document
+        chunks = (media.file_size + CHUNK_SIZE - 1) // CHUNK_SIZE
+        queued = time.perf_counter()
+        async with self.client.get_file_semaphore:
+            self.transmission_waits.append(time.perf_counter() - queued)
+            for index in range(offset, chunks):
+                if self.rng.random() < self.flood_rate:
+                    self.flood_waits += 1
+                    raise FloodWait(value=self.flood_wait)
+                size = min(CHUNK_SIZE, media.file_size - index * CHUNK_SIZE)
+                if self.download_speed:
+                    await asyncio.sleep(size / self.download_speed)
+                yield bytes(size)
+
+
+class SyntheticUpdate:
+    """Raw update wrapping a FakeMessage, parsed by LoadTest.parse_update."""
+
+    def __init__(self, message: FakeMessage) -> None:
+        self.message = message
+
+
+def make_document(size: int) -> SimpleNamespace:
+    unique_id = secrets.token_hex(8)
+    return SimpleNamespace(
+        file_id=f"file-{unique_id}",
+        file_unique_id=unique_id,
+        file_size=size,
+        file_name=f"{unique_id}.bin",
+        mime_type="application/octet-stream",
+    )
+
+
+# ==================== Load Generation ====================
+
+
+def current_rss() -> Optional[float]:
+    """Resident memory of this process in MB, or None where /proc is missing."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+
+class StageStats:
+    """Latencies and counters collected during one stage."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+        self.requests = 0
+        self.max_queue = 0
+        self.max_busy = 0
+
+
+class LoadTest:
+    def __init__(self, bot: Any, args: argparse.Namespace, api_url: str) -> None:
+        self.bot = bot
+        self.args = args
+        self.api_url = api_url
+        self.rng = random.Random(args.seed)
+        self.client = FakeClient(
+            self.rng,
+            args.api_latency,
+            args.download_mbps * 1024 * 1024,
+            args.flood_rate,
+            args.flood_wait,
+        )
+        self.owner = FakeUser(OWNER_ID)
+        self.users = [FakeUser(OWNER_ID + 1 + i) for i in range(args.users)]
+        self.uploaded: List[str] = []
+        self.pending: set = set()
+        self.baseline_rss: Optional[float] = None
+        self.previous_rss: Optional[float] = None
+        self.busy_workers = 0
+        self.stats = StageStats()
+
+    def authorize_users(self) -> None:
+        for user in [self.owner, *self.users]:
+            self.bot.authorized_users_col.insert_one(
+                {"user_id": user.id, "username": user.username}
+            )
+
+    async def start_dispatcher(self) -> None:
+        """Start the bot's dispatcher with timing around every bot handler."""
+        client = self.bot.Bot
+        self.client.install(client)
+        if self.args.workers:
+            client.workers = self.args.workers
+        if self.args.transmissions:
+            client.max_concurrent_transmissions = self.args.transmissions
+            client.save_file_semaphore = asyncio.Semaphore(self.args.transmissions)
+            client.get_file_semaphore = asyncio.Semaphore(self.args.transmissions)
+        dispatcher = client.dispatcher
+        dispatcher.update_parsers[SyntheticUpdate] = self.parse_update
+
+        # Let the handler registrations queued by bot.py's decorators finish
+        await asyncio.sleep(0)
+        for group in dispatcher.groups.values():
+            for handler in group:
+                if not isinstance(handler, MessageHandler):
+                    continue
+                # pyrofork keeps the user callback aside to check listeners first
+                attribute = (
+                    "original_callback"
+                    if hasattr(handler, "original_callback")
+                    else "callback"
+                )
+                callback = getattr(handler, attribute)
+                if getattr(callback, "__module__", None) == self.bot.__name__:
+                    setattr(handler, attribute, self.timed(callback))
+        await dispatcher.start()
+
+    async def parse_update(
+        self, update: SyntheticUpdate, users: Dict, chats: Dict
+    ) -> Any:
+        """Called by a dispatcher worker once it takes the update off the queue."""
+        update.message.dequeued = time.perf_counter()
+        return update.message, MessageHandler
+
+    def timed(self, callback: Any) -> Any:
+        """Wrap a handler callback to record which handler ran and when."""
+
+        @functools.wraps(callback)
+        async def wrapper(client: Any, message: FakeMessage) -> None:
+            message.handler = callback.__name__
+            message.started = time.perf_counter()
+            self.busy_workers += 1
+            self.stats.max_busy = max(self.stats.max_busy, self.busy_workers)
+            try:
+                await callback(client, message)
+            except Exception as e:
+                self.stats.errors[f"{callback.__name__}: {type(e).__name__}"] += 1
+                raise
+            finally:
+                self.busy_workers -= 1
+                message.finished = time.perf_counter()
+                if not message.handled.done():
+                    message.handled.set_result(None)
+
+        return wrapper
+
+    async def dispatch(self, message: FakeMessage, expected: str) -> None:
+        """Queue a message for the dispatcher and wait for its handler."""
+        stats = self.stats
+        queue = self.bot.Bot.dispatcher.updates_queue
+        message.enqueued = time.perf_counter()
+        queue.put_nowait((SyntheticUpdate(message), {}, {}))
+        stats.max_queue = max(stats.max_queue, queue.qsize())
+
+        await asyncio.wait_for(message.handled, self.args.upload_timeout)
+        stats.latencies["queue_wait"].append(message.dequeued - message.enqueued)
+        stats.latencies["filters"].append(message.started - message.dequeued)
+        stats.latencies[message.handler or "unknown"].append(
+            message.finished - message.started
+        )
+        if message.handler != expected:
+            stats.errors[f"{expected} routed to {message.handler}"] += 1
+
+    async def wait_for_upload(
+        self, reply: FakeMessage, started: float, stats: StageStats
+    ) -> None:
+        """Record the end-to-end latency of the upload started by a handler."""
+        try:
+            await asyncio.wait_for(reply.done.wait(), self.args.upload_timeout)
+        except asyncio.TimeoutError:
+            stats.errors["upload_timeout"] += 1
+            return
+        stats.latencies["upload_end_to_end"].append(time.perf_counter() - started)
+        if reply.reply_markup is None:
+            stats.errors["upload_failed"] += 1
+            return
+        file_id = reply.reply_markup.inline_keyboard[0][0].url.rsplit("/", 1)[-1]
+        self.uploaded.append(file_id)
+        del self.uploaded[: -self.args.users * 4]
+
+    async def run_scenario(self, name: str, user: FakeUser, stats: StageStats) -> None:
+        client = self.client
+        started = time.perf_counter()
+        media: Optional[FakeMessage] = None
+
+        if name == "media_filter":
+            media = FakeMessage(client, user, document=make_document(self.file_size()))
+            await self.dispatch(media, name)
+        elif name == "group_upload_command":
+            media = FakeMessage(
+                client,
+                user,
+                document=make_document(self.file_size()),
+                chat_type=ChatType.SUPERGROUP,
+            )
+            message = FakeMessage(
+                client,
+                user,
+                "/pdup",
+                reply_to_message=media,
+                chat_type=ChatType.SUPERGROUP,
+            )
+            await self.dispatch(message, name)
+        elif name == "info":
+            file_id = (
+                self.rng.choice(self.uploaded)
+                if self.uploaded
+                else secrets.token_urlsafe(6)
+            )
+            message = FakeMessage(client, user, f"https://pixeldrain.com/u/{file_id}")
+            await self.dispatch(message, name)
+        else:
+            await self.dispatch(FakeMessage(client, self.owner, "/auths"), name)
+
+        stats.latencies["response"].append(time.perf_counter() - started)
+        stats.requests += 1
+        # handle_media keeps editing its reply to the media until the upload ends
+        if media is not None and media.last_reply is not None:
+            task = asyncio.create_task(
+                self.wait_for_upload(media.last_reply, started, stats)
+            )
+            self.pending.add(task)
+            task.add_done_callback(self.pending.discard)
+
+    def file_size(self) -> int:
+        low, high = self.args.file_kb
+        return self.rng.randint(low, high) * 1024
+
+    async def user_loop(
+        self, user: FakeUser, deadline: float, stats: StageStats
+    ) -> None:
+        names = list(SCENARIOS)
+        weights = list(SCENARIOS.values())
+        while time.monotonic() < deadline:
+            name = self.rng.choices(names, weights)[0]
+            try:
+                await self.run_scenario(name, user, stats)
+            except Exception as e:
+                stats.errors[f"{name}: {type(e).__name__}"] += 1
+            await asyncio.sleep(self.rng.expovariate(1 / self.args.think_time))
+
+    async def run_stage(self, label: str, users: int, seconds: float) -> None:
+        stats = self.stats = StageStats()
+        monitor = self.bot.EventLoopLagMonitor(
+            interval=0.05, threshold=self.args.lag_threshold / 1000
+        )
+        monitor_task = asyncio.create_task(monitor.run())
+        self.client.transmission_waits = []
+        started = time.monotonic()
+        deadline = started + seconds
+        await asyncio.gather(
+            *(self.user_loop(user, deadline, stats) for user in self.users[:users])
+        )
+        if self.pending:
+            await asyncio.wait(set(self.pending), timeout=self.args.upload_timeout)
+        elapsed = time.monotonic() - started
+        if self.client.transmission_waits:
+            stats.latencies["transmission_wait"] = self.client.transmission_waits
+        monitor_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await monitor_task
+        self.report(label, users, elapsed, stats, monitor)
+
+    def report(
+        self,
+        label: str,
+        users: int,
+        elapsed: float,
+        stats: StageStats,
+        monitor: Any,
+    ) -> None:
+        gc.collect()
+        rss = current_rss()
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        out = sys.__stdout__
+        print(
+            f"\n== {label}: {users} users, {elapsed:.1f}s, "
+            f"{stats.requests / elapsed:.1f} req/s ==",
+            file=out,
+        )
+        print(
+            f"workers: {self.bot.Bot.workers}, max busy {stats.max_busy}, "
+            f"max queued updates {stats.max_queue}, "
+            f"transmissions: {self.bot.Bot.max_concurrent_transmissions}",
+            file=out,
+        )
+        print(
+            f"{'handler':<22}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'p99 ms':>10}{'max ms':>10}",
+            file=out,
+        )
+        for name, values in sorted(stats.latencies.items()):
+            print(
+                f"{name:<22}{len(values):>7}"
+                + "".join(
+                    f"{self.bot.percentile(values, pct) * 1000:>10.1f}"
+                    for pct in (50, 95, 99)
+                )
+                + f"{max(values) * 1000:>10.1f}",
+                file=out,
+            )
+        if stats.errors:
+            print(f"errors: {dict(stats.errors)}", file=out)
+        print(monitor.summary(), file=out)
+
+        if rss is None or self.baseline_rss is None:
+            memory = "memory: RSS unavailable"
+        else:
+            memory = (
+                f"memory: RSS {rss:.1f} MB "
+                f"({rss - self.previous_rss:+.1f} MB since the previous stage, "
+                f"{rss - self.baseline_rss:+.1f} MB since start)"
+            )
+            self.previous_rss = rss
+        memory += (
+            f", peak RSS {peak_rss:.1f} MB, {len(gc.get_objects())} objects, "
+            f"{len(asyncio.all_tasks())} tasks, "
+            f"{self.client.flood_waits} FloodWaits so far"
+        )
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            memory += f", traced {current / 1024 / 1024:.1f} MB (peak {peak / 1024 / 1024:.1f} MB)"
+        print(memory, file=out)
+
+    async def run(self) -> None:
+        self.authorize_users()
+        await self.start_dispatcher()
+        self.baseline_rss = self.previous_rss = current_rss()
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+
+        users = 1
+        while True:
+            await self.run_stage("ramp", users, self.args.stage_seconds)
+            if users >= self.args.users:
+                break
+            users = min(self.args.users, users + self.args.step)
+
+        soak_end = time.monotonic() + self.args.soak_seconds
+        while time.monotonic() < soak_end:
+            await self.run_stage(
+                "soak",
+                self.args.users,
+                min(self.args.stage_seconds, soak_end - time.monotonic()),
+            )
+
+        if snapshot is not None:
+            print("\nTop memory growth since the first stage:", file=sys.__stdout__)
+            growth = tracemalloc.take_snapshot().compare_to(snapshot, "lineno")
+            for stat in growth[:15]:
+                print(stat, file=sys.__stdout__)
+
+        await self.bot.Bot.dispatcher.stop()
+
+
+async def main(args: argparse.Namespace) -> None:
+    workdir = tempfile.mkdtemp(prefix="pixeldrain-loadtest-")
+    keys = [f"key{i}" for i in range(args.keys)]
+    stub = PixeldrainStub(
+        keys,
+        max_concurrent=args.key_concurrency,
+        error_rate=args.error_rate,
+        bandwidth=args.upload_mbps * 1024 * 1024,
+    )
+    api_url = await stub.start()
+
+    os.environ.update(
+        {
+            "BOT_TOKEN": "0:loadtest",
+            "API_ID": "1",
+            "API_HASH": "loadtest",
+            "MONGODB_URI": "mongodb://127.0.0.1:1",
+            "OWNER_ID": str(OWNER_ID),
+            "PIXELDRAIN_API_KEYS": ",".join(keys),
+            "PIXELDRAIN_API_URL": api_url,
+            "DOWNLOAD_DIR": os.path.join(workdir, "downloads"),
+        }
+    )
+    import bot
+
+    bot.authorized_users_col = InMemoryCollection()
+    bot.uploaded_files_col = InMemoryCollection()
+    bot.download_checkpoints_col = InMemoryCollection()
+
+    test = LoadTest(bot, args, api_url)
+    output = open(os.devnull, "w") if args.quiet else sys.stdout
+    try:
+        with contextlib.redirect_stdout(output):
+            await test.run()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        await stub.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="Maximum users")
+    parser.add_argument("--step", type=int, default=5, help="Users added per stage")
+    parser.add_argument("--stage-seconds", type=float, default=15)
+    parser.add_argument(
+        "--soak-seconds", type=float, default=0, help="Time to hold the maximum"
+    )
+    parser.add_argument(
+        "--think-time", type=float, default=1.0, help="Mean pause between requests"
+    )
+    parser.add_argument(
+        "--file-kb",
+        type=int,
+        nargs=2,
+        default=(64, 4096),
+        metavar=("MIN", "MAX"),
+        help="Size range of uploaded media",
+    )
+    parser.add_argument("--download-mbps", type=float, default=20)
+    parser.add_argument("--upload-mbps", type=int, default=20)
+    parser.add_argument(
+        "--api-latency", type=float, default=0.02, help="Bot API call latency"
+    )
+    parser.add_argument(
+        "--flood-rate", type=float, default=0.002, help="FloodWaits per chunk"
+    )
+    parser.add_argument("--flood-wait", type=int, default=1)
+    parser.add_argument("--keys", type=int, default=2, help="Pixeldrain API keys")
+    parser.add_argument(
+        "--key-concurrency", type=int, default=0, help="Uploads per key at once"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Pixeldrain 5xx rate"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Override the Client's handler workers (default: pyrogram's)",
+    )
+    parser.add_argument(
+        "--transmissions",
+        type=int,
+        default=0,
+        help="Override the Client's concurrent downloads (default: pyrogram's)",
+    )
+    parser.add_argument("--upload-timeout", type=float, default=120)
+    parser.add_argument("--lag-threshold", type=float, default=100, help="In ms")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--tracemalloc", action="store_true", help="Trace allocations (slower)"
+    )
+    parser.add_argument("--quiet", action="store_true", help="Hide bot output")
+    args = parser.parse_args()
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        print("Load test stopped.")
@@ -0,0 +1,243 @@
+"""
+Local stand-in for the Pixeldrain API with per-key limits.
+
+Used to exercise the bot's API key pool without touching pixeldrain.com:
+
+    python pixeldrain_stub.py --keys key1,key2 --max-concurrent 2 --quota-mb 500
+    PIXELDRAIN_API_URL=http://127.0.0.1:8080/api PIXELDRAIN_API_KEYS=key1,key2 python bot.py
+"""
+
+import argparse
+import asyncio
+import base64
+import random
+import secrets
+import time
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any
+
+from aiohttp import web
+
+
+class StubAccount:
+    """Usage counters for a single API key."""
+
+    def __init__(self, api_key: str) -> None:
+        self.api_key = api_key
+        self.in_flight = 0
+        self.used_bytes = 0
+        self.uploads = 0
+        self.rejected = 0
+        self.window_start = 0.0
+        self.window_uploads = 0
+
+
+class PixeldrainStub:
+    """
+    Minimal Pixeldrain API: upload, file info and delete.
+
+    Every key can be limited independently by concurrent uploads, uploads per
+    second and total stored bytes, and requests can be slowed down or made to
+    fail randomly to simulate an unhealthy account.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        max_concurrent: int = 0,
+        rate_limit: int = 0,
+        quota_bytes: int = 0,
+        error_rate: float = 0.0,
+        latency: float = 0.0,
+        bandwidth: int = 0,
+    ) -> None:
+        self.accounts = {key: StubAccount(key) for key in keys}
+        self.max_concurrent = max_concurrent
+        self.rate_limit = rate_limit
+        self.quota_bytes = quota_bytes
+        self.error_rate = error_rate
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application(client_max_size=0)
+        self.app.add_routes(
+            [
+                web.post("/api/file", self.upload),
+                web.get("/api/file/{id}/info", self.info),
+                web.delete("/api/file/{id}", self.delete),
+                web.get("/stub/stats", self.stats),
+            ]
+        )
+
+    @staticmethod
+    def error(status: int, value: str, **headers: str) -> web.Response:
+        return web.json_response(
+            {"success": False, "value": value}, status=status, headers=headers
+        )
+
+    def get_account(self, request: web.Request) -> Optional[StubAccount]:
+        """Resolve the account from the Basic Auth header."""
+        header = request.headers.get("Authorization", "")
+        if not header.startswith("Basic "):
+            return None
+        try:
+            _, _, key = base64.b64decode(header[6:]).decode().partition(":")
+        except ValueError:
+            return None
+        return self.accounts.get(key)
+
+    def over_rate_limit(self, account: StubAccount) -> bool:
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        if now - account.window_start >= 1:
+            account.window_start = now
+            account.window_uploads = 0
+        account.window_uploads += 1
+        return account.window_uploads > self.rate_limit
+
+    async def upload(self, request: web.Request) -> web.Response:
+        account = self.get_account(request)
+        if not account:
+            return self.error(401, "unauthorized")
+
+        if (
+            self.max_concurrent and account.in_flight >= self.max_concurrent
+        ) or self.over_rate_limit(account):
+            account.rejected += 1
+            return self.error(429, "rate_limited", **{"Retry-After": "1"})
+
+        if random.random() < self.error_rate:
+            account.rejected += 1
+            return self.error(500, "internal_server_error")
+
+        account.in_flight += 1
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            reader = await request.multipart()
+            field = await reader.next()
+            if field is None or field.name != "file":
+                return self.error(422, "no_file")
+
+            name = field.filename or "file"
+            size = 0
+            while True:
+                chunk = await field.read_chunk(1024 * 1024)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if self.quota_bytes and account.used_bytes + size > self.quota_bytes:
+                    account.rejected += 1
+                    return self.error(403, "storage_quota_exceeded")
+                if self.bandwidth:
+                    await asyncio.sleep(len(chunk) / self.bandwidth)
+
+            file_id = secrets.token_urlsafe(6)
+            account.used_bytes += size
+            account.uploads += 1
+            self.files[file_id] = {
+                "id": file_id,
+                "name": name,
+                "size": size,
+                "date_upload": datetime.now(timezone.utc).isoformat(),
+                "mime_type": field.headers.get(
+                    "Content-Type", "application/octet-stream"
+                ),
+                "owner": account.api_key,
+            }
+            return web.json_response({"id": file_id}, status=201)
+        finally:
+            account.in_flight -= 1
+
+    async def info(self, request: web.Request) -> web.Response:
+        data = self.files.get(request.match_info["id"])
+        if not data:
+            return self.error(404, "not_found")
+        return web.json_response({k: v for k, v in data.items() if k != "owner"})
+
+    async def delete(self, request: web.Request) -> web.Response:
+        account = self.get_account(request)
+        data = self.files.get(request.match_info["id"])
+        if not data:
+            return self.error(404, "not_found")
+        if not account or account.api_key != data["owner"]:
+            return self.error(403, "forbidden")
+        del self.files[data["id"]]
+        account.used_bytes -= data["size"]
+        return web.json_response({"success": True, "value": "file_deleted"})
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                key: {
+                    "in_flight": account.in_flight,
+                    "used_bytes": account.used_bytes,
+                    "uploads": account.uploads,
+                    "rejected": account.rejected,
+                }
+                for key, account in self.accounts.items()
+            }
+        )
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the API base URL."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        return f"http://{host}:{bound_port}/api"
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def serve(args: argparse.Namespace) -> None:
+    stub = PixeldrainStub(
+        [key.strip() for key in args.keys.split(",") if key.strip()],
+        max_concurrent=args.max_concurrent,
+        rate_limit=args.rate_limit,
+        quota_bytes=args.quota_mb * 1024 * 1024,
+        error_rate=args.error_rate,
+        latency=args.latency,
+        bandwidth=args.bandwidth_kb * 1024,
+    )
+    url = await stub.start(args.host, args.port)
+    print(f"Pixeldrain stub listening on {url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--keys", required=True, help="Comma separated API keys")
+    parser.add_argument(
+        "--max-concurrent", type=int, default=0, help="Concurrent uploads per key"
+    )
+    parser.add_argument(
+        "--rate-limit", type=int, default=0, help="Uploads per second per key"
+    )
+    parser.add_argument("--quota-mb", type=int, default=0, help="Storage per key")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of uploads failing"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to uploads"
+    )
+    parser.add_argument(
+        "--bandwidth-kb", type=int, default=0, help="Upload speed per request"
+    )
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        print("Pixeldrain stub stopped.")
@@ -0,0 +1,12 @@
+import os
+import sys
+
+# bot.py validates its settings and connects lazily at import time
+os.environ.setdefault("BOT_TOKEN", "0:test")
+os.environ.setdefault("API_ID", "1")
+os.environ.setdefault("API_HASH", "test")
+os.environ.setdefault("MONGODB_URI", "mongodb://127.0.0.1:1")
+os.environ.setdefault("OWNER_ID", "1")
+os.environ.setdefault("PIXELDRAIN_API_KEY", "test")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
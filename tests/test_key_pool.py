@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+import bot
+from pixeldrain_stub import PixeldrainStub
+
+NOW = 1000.0
+
+
+def make_pool(keys, policy="least_inflight"):
+    return bot.PixeldrainKeyPool(keys, policy=policy, clock=lambda: NOW)
+
+
+def account(pool, key):
+    return next(a for a in pool.accounts if a.api_key == key)
+
+
+def make_file(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(b"\0" * size)
+    return str(path)
+
+
+def run_with_stub(monkeypatch, keys, scenario, **limits):
+    """Run `scenario(stub)` with bot pointed at a fresh PixeldrainStub."""
+
+    async def main():
+        stub = PixeldrainStub(keys, **limits)
+        monkeypatch.setattr(bot, "PIXELDRAIN_API_URL", await stub.start())
+        try:
+            return await scenario(stub)
+        finally:
+            await stub.stop()
+
+    return asyncio.run(main())
+
+
+def test_weighted_policy_uses_smooth_round_robin():
+    pool = make_pool([("a", 3), ("b", 1)], policy="weighted")
+    picks = []
+    for _ in range(4):
+        picked = pool.acquire()
+        picks.append(picked.api_key)
+        pool.release(picked, {"id": "x"})
+    assert picks == ["a", "a", "b", "a"]
+
+
+def test_least_inflight_spreads_concurrent_uploads(monkeypatch, tmp_path):
+    paths = [make_file(tmp_path, f"f{i}", 1024) for i in range(2)]
+    pool = make_pool([("k1", 1), ("k2", 1)])
+
+    async def scenario(stub):
+        return await asyncio.gather(
+            *(bot.upload_with_pool(path, pool) for path in paths)
+        )
+
+    results = run_with_stub(
+        monkeypatch, ["k1", "k2"], scenario, max_concurrent=1, latency=0.2
+    )
+    assert all("id" in response for response, _, _ in results)
+    assert sorted(used.api_key for _, _, used in results) == ["k1", "k2"]
+    assert all(a.is_healthy(NOW) and a.in_flight == 0 for a in pool.accounts)
+
+
+def test_unknown_key_is_ejected_and_upload_fails_over(monkeypatch, tmp_path):
+    path = make_file(tmp_path, "f", 1024)
+    pool = make_pool([("revoked", 1), ("good", 1)])
+
+    async def scenario(stub):
+        return await bot.upload_with_pool(path, pool)
+
+    response, _, used = run_with_stub(monkeypatch, ["good"], scenario)
+    assert "id" in response
+    assert used.api_key == "good"
+    assert account(pool, "revoked").ejected_until == NOW + bot.KEY_AUTH_EJECT
+    assert account(pool, "good").is_healthy(NOW)
+
+
+def test_server_errors_eject_with_exponential_backoff(monkeypatch, tmp_path):
+    path = make_file(tmp_path, "f", 1024)
+    pool = make_pool([("k1", 1)])
+
+    async def scenario(stub):
+        return [await bot.upload_with_pool(path, pool) for _ in range(2)]
+
+    results = run_with_stub(monkeypatch, ["k1"], scenario, error_rate=1.0)
+    assert [response["status"] for response, _, _ in results] == [500, 500]
+    k1 = account(pool, "k1")
+    assert k1.failures == 2
+    assert k1.ejected_until == NOW + bot.KEY_BACKOFF_BASE * 2
+
+
+def test_rate_limit_honours_retry_after(monkeypatch, tmp_path):
+    # Successful uploads delete their file, so each attempt gets its own
+    paths = [make_file(tmp_path, f"f{i}", 1024) for i in range(2)]
+    pool = make_pool([("k1", 1)])
+
+    async def scenario(stub):
+        return [await bot.upload_with_pool(path, pool) for path in paths]
+
+    results = run_with_stub(monkeypatch, ["k1"], scenario, rate_limit=1)
+    assert "id" in results[0][0]
+    assert results[1][0]["status"] == 429
+    k1 = account(pool, "k1")
+    assert k1.failures == 1
+    assert k1.ejected_until == NOW + 1
+
+
+def test_quota_error_never_ejects_the_last_healthy_key(monkeypatch, tmp_path):
+    big = make_file(tmp_path, "big", 2 * 1024 * 1024)
+    small = make_file(tmp_path, "small", 1024)
+    pool = make_pool([("k1", 1), ("k2", 1)])
+
+    async def scenario(stub):
+        return [
+            await bot.upload_with_pool(big, pool),
+            await bot.upload_with_pool(small, pool),
+        ]
+
+    (big_response, _, _), (small_response, _, small_account) = run_with_stub(
+        monkeypatch, ["k1", "k2"], scenario, quota_bytes=1024 * 1024
+    )
+    assert big_response["value"] == "storage_quota_exceeded"
+    ejected = [a for a in pool.accounts if not a.is_healthy(NOW)]
+    assert len(ejected) == 1
+    assert ejected[0].failures == 1
+    assert ejected[0].ejected_until == NOW + bot.KEY_BACKOFF_BASE
+    assert "id" in small_response
+    assert small_account.is_healthy(NOW)
+
+
+@pytest.mark.parametrize("policy", bot.PixeldrainKeyPool.POLICIES)
+def test_policy_still_applies_when_every_key_is_ejected(policy):
+    pool = make_pool([("a", 1), ("b", 1)], policy=policy)
+    for candidate in pool.accounts:
+        candidate.ejected_until = NOW + 60
+    picks = [pool.acquire().api_key for _ in range(4)]
+    assert sorted(picks) == ["a", "a", "b", "b"]